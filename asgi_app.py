@@ -0,0 +1,55 @@
+import contextlib
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.routing import Mount, Route
+from routes.async_webhook_routes import webhook_routes
+from config import (ALPACA_API_KEY, ALPACA_SECRET_KEY, BASE_URL, PRICE_BASE_URL,
+                    HTTP_MAX_CONNECTIONS, HTTP_TIMEOUT, LOG_FILE)
+from services.async_alpaca_client import AsyncAlpacaClient
+from services.async_price_fetcher import create_price_client
+from services.logger import setup_logging
+
+# ASGI alternative to app.py serving the same webhook contract on one event loop.
+# Run with: uvicorn asgi_app:app --host 0.0.0.0 --port 5001
+
+# Setup logging
+setup_logging(LOG_FILE)
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    # One connection pool per upstream, shared by every in-flight webhook
+    app.state.alpaca = AsyncAlpacaClient(ALPACA_API_KEY, ALPACA_SECRET_KEY, BASE_URL,
+                                         max_connections=HTTP_MAX_CONNECTIONS, timeout=HTTP_TIMEOUT)
+    app.state.prices = create_price_client(PRICE_BASE_URL, max_connections=HTTP_MAX_CONNECTIONS,
+                                           timeout=HTTP_TIMEOUT)
+    try:
+        yield
+    finally:
+        await app.state.alpaca.close()
+        await app.state.prices.close()
+
+
+async def index(request):
+    return PlainTextResponse("ASGI running!")
+
+
+async def status(request):
+    return JSONResponse({"status": "Application is running", "version": "1.0"})
+
+
+# Initialize ASGI app and register routes
+app = Starlette(
+    routes=[
+        Route("/", index),
+        Route("/status", status),
+        Mount("/webhook", routes=webhook_routes),
+    ],
+    lifespan=lifespan,
+)
+
+if __name__ == '__main__':
+    import uvicorn
+
+    # Specify the host and port
+    uvicorn.run(app, host='0.0.0.0', port=5001)
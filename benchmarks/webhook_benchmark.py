@@ -0,0 +1,282 @@
+"""Compare the Flask/threaded app (app.py) with the ASGI app (asgi_app.py).
+
+Both apps are pointed at a local fake broker that serves the Alpaca REST and
+Yahoo chart endpoints with a fixed artificial latency, so the numbers reflect
+how many in-flight webhooks each serving model sustains while waiting on I/O.
+
+    python benchmarks/webhook_benchmark.py --requests 1000 --concurrency 200 --latency 0.05
+
+Results for ``--requests 400 --latency 0.05`` with 2 positions, on one vCPU that
+is shared by the fake broker, both apps and the load generator. Both targets
+placed one buy per request (400 orders each), as counted by the fake broker:
+
+    concurrency  target   req/s   p50 ms   p95 ms   p99 ms
+    1            flask      2.0    491.8    507.9    540.2
+    1            asgi       4.7    211.3    213.5    216.3
+    50           flask     44.2   1045.4   1573.0   1676.1
+    50           asgi     190.5    245.6    333.0    349.2
+    200          flask     56.6   3316.1   3875.4   4119.1
+    200          asgi     223.2    803.4   1056.8   1114.9
+
+The run exits with an error if the targets place different numbers of
+orders, because the handlers answer 200 even when a broker call fails.
+
+Not all of the gap is down to the serving model. A Flask buy makes 2N+1
+sequential price lookups for N positions plus three sequential Alpaca calls
+(9 round trips here). The async path makes N+1 price lookups and overlaps
+the independent ones (4 round trips). That call pattern alone explains the
+~2.3x at concurrency 1. The rest, at higher concurrency, is thread-per-request
+versus a single event loop.
+"""
+import argparse
+import asyncio
+import collections
+import logging
+import multiprocessing
+import os
+import socket
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import aiohttp
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _use_fake_broker(broker_url):
+    """Point config at the fake broker before any app module imports it."""
+    import config
+
+    config.ALPACA_API_KEY = "bench-key"
+    config.ALPACA_SECRET_KEY = "bench-secret"
+    config.BASE_URL = broker_url
+    config.PRICE_BASE_URL = broker_url
+    config.LOG_FILE = os.path.join(tempfile.mkdtemp(prefix="webhook-bench-"), "app.log")
+    logging.disable(logging.WARNING)  # includes urllib3 'Connection pool is full' noise from the Alpaca SDK
+    sys.stdout = open(os.devnull, "w")  # services.alpaca_client prints balances per trade
+
+
+def _serve_fake_broker(port, latency, num_positions):
+    import uvicorn
+    from starlette.applications import Starlette
+    from starlette.responses import JSONResponse
+    from starlette.routing import Route
+
+    # Calls received per endpoint, so a target that fails quietly (still answering 200) shows up
+    counts = collections.Counter()
+
+    positions = [
+        {"symbol": f"POS{i}", "qty": "10", "qty_available": "10", "market_value": "1000", "current_price": "100"}
+        for i in range(num_positions)
+    ]
+
+    async def account(request):
+        counts["accounts"] += 1
+        await asyncio.sleep(latency)
+        return JSONResponse({"id": "bench", "status": "ACTIVE", "cash": "100000"})
+
+    async def list_positions(request):
+        counts["positions"] += 1
+        await asyncio.sleep(latency)
+        return JSONResponse(positions)
+
+    async def submit_order(request):
+        order = await request.json()
+        counts["orders"] += 1
+        await asyncio.sleep(latency)
+        return JSONResponse({
+            "id": str(uuid.uuid4()),
+            "symbol": order["symbol"],
+            "qty": str(order["qty"]),
+            "side": order["side"],
+            "type": order["type"],
+            "time_in_force": order["time_in_force"],
+            "status": "accepted",
+            "submitted_at": datetime.now(timezone.utc).isoformat(),
+        })
+
+    async def chart(request):
+        await asyncio.sleep(latency)
+        symbol = request.path_params["symbol"]
+        return JSONResponse({"chart": {"result": [{"meta": {"symbol": symbol, "regularMarketPrice": 100.0},
+                                                   "indicators": {"quote": [{"close": [100.0]}]}}],
+                                       "error": None}})
+
+    async def read_counts(request):
+        return JSONResponse(counts)
+
+    async def reset_counts(request):
+        counts.clear()
+        return JSONResponse(counts)
+
+    app = Starlette(routes=[
+        Route("/_counts", read_counts),
+        Route("/_counts", reset_counts, methods=["DELETE"]),
+        Route("/v2/account", account),
+        Route("/v2/positions", list_positions),
+        Route("/v2/orders", submit_order, methods=["POST"]),
+        Route("/v8/finance/chart/{symbol:path}", chart),
+    ])
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning", backlog=4096)
+
+
+def _serve_flask(port, broker_url):
+    _use_fake_broker(broker_url)
+    import requests
+    from werkzeug.serving import make_server
+    import routes.webhook_routes
+    import services.alpaca_client
+    from app import app
+
+    def get_live_price_with_fallback(symbol):
+        # yfinance cannot be redirected, so do the equivalent blocking lookup against the fake broker
+        try:
+            response = requests.get(f"{broker_url}/v8/finance/chart/{symbol}", timeout=10)
+            return response.json()["chart"]["result"][0]["indicators"]["quote"][0]["close"][-1]
+        except Exception as e:
+            logging.error(f"Error fetching price for {symbol}: {e}")
+            return None
+
+    routes.webhook_routes.get_live_price_with_fallback = get_live_price_with_fallback
+    services.alpaca_client.get_live_price_with_fallback = get_live_price_with_fallback
+
+    # Same serving model as app.run(): one thread per request
+    make_server("127.0.0.1", port, app, threaded=True).serve_forever()
+
+
+def _serve_asgi(port, broker_url):
+    _use_fake_broker(broker_url)
+    import uvicorn
+    from asgi_app import app
+
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning", backlog=4096)
+
+
+async def _wait_until_ready(url, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    async with aiohttp.ClientSession() as session:
+        while time.monotonic() < deadline:
+            try:
+                async with session.get(url):
+                    return
+            except aiohttp.ClientConnectionError:
+                await asyncio.sleep(0.1)
+    raise RuntimeError(f"Server at {url} did not start within {timeout}s")
+
+
+async def _broker_counts(broker_url, method="GET"):
+    async with aiohttp.ClientSession() as session:
+        async with session.request(method, f"{broker_url}/_counts") as response:
+            return await response.json()
+
+
+async def _run_load(base_url, num_requests, concurrency):
+    """Fire ``num_requests`` buy signals with at most ``concurrency`` in flight."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    timeout = aiohttp.ClientTimeout(total=120.0)
+
+    async with aiohttp.ClientSession(base_url=base_url, connector=connector, timeout=timeout) as session:
+        async def send(i):
+            nonlocal errors
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    async with session.post("/webhook/", json={"symbol": f"SYM{i % 50}", "message": "buy"}) as response:
+                        await response.read()
+                        if response.status != 200:
+                            errors += 1
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    errors += 1
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(send(i) for i in range(num_requests)))
+        elapsed = time.perf_counter() - start
+
+    return elapsed, latencies, errors
+
+
+def _benchmark(name, target, broker_url, args):
+    port = _free_port()
+    process = multiprocessing.Process(target=target, args=(port, broker_url), daemon=True)
+    process.start()
+    try:
+        base_url = f"http://127.0.0.1:{port}"
+        asyncio.run(_wait_until_ready(f"{base_url}/status"))
+        asyncio.run(_run_load(base_url, min(args.concurrency, args.requests), args.concurrency))  # warm-up
+        asyncio.run(_broker_counts(broker_url, "DELETE"))
+        elapsed, latencies, errors = asyncio.run(_run_load(base_url, args.requests, args.concurrency))
+        counts = asyncio.run(_broker_counts(broker_url))
+    finally:
+        process.terminate()
+        process.join()
+
+    percentiles = statistics.quantiles(latencies, n=100)
+    print(f"{name:<8} {args.requests / elapsed:>10.1f} {percentiles[49] * 1000:>10.1f} "
+          f"{percentiles[94] * 1000:>10.1f} {percentiles[98] * 1000:>10.1f} {errors:>8} "
+          f"{counts.get('accounts', 0):>9} {counts.get('positions', 0):>10} {counts.get('orders', 0):>8}")
+    return counts
+
+
+def _at_least_two(value):
+    # Latency percentiles need at least two samples
+    value = int(value)
+    if value < 2:
+        raise argparse.ArgumentTypeError("must be at least 2")
+    return value
+
+
+def _at_least_one(value):
+    # A zero-sized semaphore would never let a request through
+    value = int(value)
+    if value < 1:
+        raise argparse.ArgumentTypeError("must be at least 1")
+    return value
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=_at_least_two, default=1000, help="webhooks sent per target")
+    parser.add_argument("--concurrency", type=_at_least_one, default=200, help="maximum webhooks in flight")
+    parser.add_argument("--latency", type=float, default=0.05, help="fake broker latency per call (seconds)")
+    parser.add_argument("--positions", type=int, default=2, help="open positions reported by the fake broker")
+    parser.add_argument("--targets", nargs="+", choices=["flask", "asgi"], default=["flask", "asgi"])
+    args = parser.parse_args()
+
+    broker_port = _free_port()
+    broker_url = f"http://127.0.0.1:{broker_port}"
+    broker = multiprocessing.Process(target=_serve_fake_broker,
+                                     args=(broker_port, args.latency, args.positions), daemon=True)
+    broker.start()
+    try:
+        asyncio.run(_wait_until_ready(f"{broker_url}/v2/account"))
+        print(f"{args.requests} requests, concurrency {args.concurrency}, "
+              f"broker latency {args.latency * 1000:.0f} ms, {args.positions} positions")
+        print(f"{'target':<8} {'req/s':>10} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'errors':>8} "
+              f"{'accounts':>9} {'positions':>10} {'orders':>8}")
+        targets = {"flask": _serve_flask, "asgi": _serve_asgi}
+        orders = {name: _benchmark(name, targets[name], broker_url, args).get("orders", 0) for name in args.targets}
+    finally:
+        broker.terminate()
+        broker.join()
+
+    # Handlers swallow broker errors and still answer 200, so compare the work done, not just the status codes
+    if len(set(orders.values())) > 1:
+        sys.exit(f"Targets placed different numbers of orders for the same load: {orders}")
+
+
+if __name__ == '__main__':
+    main()
@@ -7,6 +7,13 @@ ALPACA_SECRET_KEY = ""  # Replace with your actual Alpaca secret key
 # Base URL for Alpaca (paper trading environment)
 BASE_URL = "https://api.alpaca.markets"
 
+# Yahoo Finance chart API used by the async price fetcher
+PRICE_BASE_URL = "https://query1.finance.yahoo.com"
+
+# HTTP connection pool shared by in-flight webhooks on the ASGI app (asgi_app.py)
+HTTP_MAX_CONNECTIONS = 100
+HTTP_TIMEOUT = 10.0  # seconds
+
 # Optional: Other API configurations
 # Uncomment or add other API keys as needed for your project
 # YAHOO_FINANCE_API_KEY = "your_yahoo_finance_api_key"
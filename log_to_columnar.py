@@ -0,0 +1,269 @@
+"""Convert the bot's text logs into partitioned columnar files for analytics.
+
+Each input log is streamed line by line (constant memory) and split into
+decisions, orders, prices and errors tables, written under
+
+    <out>/<table>/date=YYYY-MM-DD/<source>-<start offset>-<part>.parquet   (or .arrow)
+
+``--format arrow`` writes Arrow IPC files that can be opened zero-copy with
+``pyarrow.memory_map``. Files are converted in parallel with a process pool.
+Byte offsets are kept in ``<out>/_state.json`` so a rerun only parses bytes
+appended since the previous run; a rotated log, or one truncated in place
+(detected by a hash of its first bytes), starts over.
+
+    python log_to_columnar.py trading_decisions.log logs/app.log -o analytics
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from config import LOG_FILE
+from services.log_parser import DECISIONS, ERRORS, ORDERS, PRICES, parse_line
+
+STATE_FILE = "_state.json"
+
+# Bytes hashed from the start of each log to detect in-place truncation (copytruncate)
+HEAD_BYTES = 1024
+
+# Columns shared by every table: log timestamp, source log path and byte offset of the line
+COMMON_FIELDS = [
+    pa.field("ts", pa.timestamp("ms")),
+    pa.field("source", pa.string()),
+    pa.field("offset", pa.int64()),
+]
+
+SCHEMAS = {
+    DECISIONS: pa.schema(COMMON_FIELDS + [
+        pa.field("submitted_at", pa.string()),
+        pa.field("symbol", pa.string()),
+        pa.field("decision", pa.string()),
+        pa.field("price", pa.float64()),
+        pa.field("amount", pa.float64()),
+    ]),
+    ORDERS: pa.schema(COMMON_FIELDS + [
+        pa.field("symbol", pa.string()),
+        pa.field("side", pa.string()),
+        pa.field("qty", pa.float64()),
+        pa.field("notional", pa.float64()),
+    ]),
+    PRICES: pa.schema(COMMON_FIELDS + [
+        pa.field("symbol", pa.string()),
+        pa.field("price", pa.float64()),
+    ]),
+    ERRORS: pa.schema(COMMON_FIELDS + [
+        pa.field("logger", pa.string()),
+        pa.field("level", pa.string()),
+        pa.field("message", pa.string()),
+    ]),
+}
+
+EXTENSIONS = {"parquet": ".parquet", "arrow": ".arrow"}
+
+
+class PartitionedWriter:
+    """Buffer rows of one table and write them to date partitions in fixed-size batches.
+
+    Logs are chronological, so only the current date's part is open at a time:
+    a new date closes the previous part, keeping memory flat however many days
+    a log spans.
+    """
+
+    def __init__(self, out_dir, table, part_name, fmt, batch_size):
+        self.out_dir = out_dir
+        self.table = table
+        self.part_name = part_name
+        self.fmt = fmt
+        self.batch_size = batch_size
+        self.schema = SCHEMAS[table]
+        self.date = None
+        self.buffer = []
+        self.writer = None  # (writer, tmp path, final path) of the open part
+        self.parts = 0
+        self.rows = 0
+
+    def add(self, date, row):
+        if date != self.date:
+            self._close_part()
+            self.date = date
+        self.buffer.append(row)
+        if len(self.buffer) >= self.batch_size:
+            self._flush()
+
+    def _flush(self):
+        if not self.buffer:
+            return
+        batch = pa.RecordBatch.from_arrays(
+            [pa.array(column, type=self.schema.field(i).type) for i, column in enumerate(zip(*self.buffer))],
+            schema=self.schema,
+        )
+        if self.writer is None:
+            partition = os.path.join(self.out_dir, self.table, f"date={self.date}")
+            os.makedirs(partition, exist_ok=True)
+            # Numbered per part so a date seen again later (out-of-order lines) never overwrites a part
+            name = f"{self.part_name}-{self.parts:04d}{EXTENSIONS[self.fmt]}"
+            # Dot-prefixed so pyarrow dataset readers skip parts that are still being written
+            tmp_path = os.path.join(partition, f".{name}.tmp")
+            if self.fmt == "parquet":
+                writer = pq.ParquetWriter(tmp_path, self.schema)
+            else:
+                writer = pa.ipc.new_file(tmp_path, self.schema)
+            self.writer = (writer, tmp_path, os.path.join(partition, name))
+            self.parts += 1
+        self.writer[0].write_batch(batch)
+        self.rows += len(self.buffer)
+        self.buffer = []
+
+    def _close_part(self):
+        self._flush()
+        if self.writer is not None:
+            writer, tmp_path, path = self.writer
+            writer.close()
+            os.replace(tmp_path, path)
+            self.writer = None
+
+    def close(self):
+        self._close_part()
+
+    def abort(self):
+        """Drop the open part and buffered rows, leaving no temp file behind."""
+        self.buffer = []
+        if self.writer is not None:
+            writer, tmp_path, _ = self.writer
+            try:
+                writer.close()
+            finally:
+                os.remove(tmp_path)
+            self.writer = None
+
+
+def head_fingerprint(path, length=HEAD_BYTES):
+    """Return ``(length, sha1)`` of the first ``length`` bytes of ``path``."""
+    with open(path, "rb") as f:
+        head = f.read(length)
+    return len(head), hashlib.sha1(head).hexdigest()
+
+
+def _source_id(path, inode, head):
+    # Inode and head fingerprint keep a rotated or copytruncated log from overwriting earlier parts
+    return hashlib.sha1(f"{os.path.abspath(path)}:{inode}:{head}".encode()).hexdigest()[:12]
+
+
+def convert_file(path, start_offset, inode, head, out_dir, fmt, batch_size):
+    """Parse ``path`` from ``start_offset`` up to its last complete line.
+
+    Runs in a worker process. Returns ``(path, end_offset, rows per table)``.
+    Parts published before a failure are rewritten under the same names on the
+    retry, since the retry resumes from the same offset.
+    """
+    part_name = f"{_source_id(path, inode, head)}-{start_offset:012d}"
+    writers = {table: PartitionedWriter(out_dir, table, part_name, fmt, batch_size) for table in SCHEMAS}
+    source = os.path.abspath(path)
+    offset = start_offset
+
+    try:
+        with open(path, "rb") as f:
+            f.seek(start_offset)
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break  # Line still being written; pick it up on the next run
+                record = parse_line(raw.decode("utf-8", errors="replace").rstrip("\r\n"))
+                if record is not None:
+                    table, date, timestamp, row = record
+                    writers[table].add(date, (timestamp, source, offset) + row)
+                offset += len(raw)
+
+        for writer in writers.values():
+            writer.close()
+    except BaseException:
+        for writer in writers.values():
+            writer.abort()
+        raise
+    return path, offset, {table: writer.rows for table, writer in writers.items()}
+
+
+def load_state(out_dir):
+    try:
+        with open(os.path.join(out_dir, STATE_FILE)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_state(out_dir, state):
+    path = os.path.join(out_dir, STATE_FILE)
+    with open(path + ".tmp", "w") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+
+def resume_offset(path, entry, stat):
+    """Offset to resume from, or 0 when the log was rotated or truncated."""
+    if not entry or entry["inode"] != stat.st_ino or entry["offset"] > stat.st_size:
+        return 0
+    # Truncated in place and already regrown past the old offset: same inode, different head
+    if head_fingerprint(path, entry["head_len"]) != (entry["head_len"], entry["head"]):
+        return 0
+    return entry["offset"]
+
+
+def convert_logs(paths, out_dir, fmt="parquet", workers=1, batch_size=50000):
+    """Convert the new bytes of each log in ``paths`` and record progress in ``out_dir``."""
+    os.makedirs(out_dir, exist_ok=True)
+    state = load_state(out_dir)
+
+    jobs = []
+    for path in dict.fromkeys(paths):
+        if not os.path.exists(path):
+            logging.warning(f"Skipping missing log file: {path}")
+            continue
+        stat = os.stat(path)
+        key = os.path.abspath(path)
+        start_offset = resume_offset(path, state.get(key), stat)
+        if start_offset == stat.st_size:
+            logging.info(f"{path}: no new data")
+            continue
+        head_len, head = head_fingerprint(path)
+        jobs.append((path, key, start_offset, stat.st_ino, head_len, head))
+
+    with ProcessPoolExecutor(max_workers=max(1, min(workers, len(jobs)))) as pool:
+        futures = {
+            pool.submit(convert_file, path, start_offset, inode, head, out_dir, fmt, batch_size):
+                (key, start_offset, inode, head_len, head)
+            for path, key, start_offset, inode, head_len, head in jobs
+        }
+        for future in as_completed(futures):
+            key, start_offset, inode, head_len, head = futures[future]
+            try:
+                path, end_offset, counts = future.result()
+            except Exception as e:
+                logging.error(f"Error converting {key}: {e}")
+                continue
+            # Record progress per file so a failure elsewhere does not force a re-parse
+            state[key] = {"offset": end_offset, "inode": inode, "head_len": head_len, "head": head}
+            save_state(out_dir, state)
+            logging.info(f"{path}: parsed bytes {start_offset}-{end_offset}, rows {counts}")
+    return state
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("logs", nargs="*", default=["trading_decisions.log", LOG_FILE],
+                        help=f"log files to convert (default: trading_decisions.log and {LOG_FILE})")
+    parser.add_argument("-o", "--out", default="analytics", help="output directory")
+    parser.add_argument("--format", choices=sorted(EXTENSIONS), default="parquet")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="parallel worker processes")
+    parser.add_argument("--batch-size", type=int, default=50000, help="rows per written batch / row group")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    convert_logs(args.logs, args.out, args.format, args.workers, args.batch_size)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from services.async_alpaca_client import execute_trade, execute_sell
+from services.async_price_fetcher import get_live_price_with_fallback
+import logging
+
+
+async def webhook(request):
+    # Pooled clients are created once per app in asgi_app.lifespan
+    alpaca = request.app.state.alpaca
+    prices = request.app.state.prices
+    try:
+        # Parse the incoming JSON request
+        json_data = await request.json()
+        if not json_data or 'message' not in json_data or 'symbol' not in json_data:
+            return JSONResponse({'status': 'error', 'message': 'Invalid JSON data format'}, status_code=400)
+
+        symbol = json_data['symbol']
+        message = json_data['message'].lower()  # Normalize message case for comparison
+
+        if message == 'buy':
+            # Fetch the current price using the fallback method
+            current_price = await get_live_price_with_fallback(prices, symbol)
+            if current_price:
+                await execute_trade(alpaca, prices, symbol, 'buy')
+                return JSONResponse({'status': 'success', 'message': f"Bought {symbol} at ${current_price:.2f}."})
+            else:
+                return JSONResponse({'status': 'error', 'message': f"Unable to fetch price for {symbol}."}, status_code=500)
+
+        elif message == 'sell':
+            # Execute sell action without checking the price
+            await execute_sell(alpaca, prices, symbol)
+            return JSONResponse({'status': 'success', 'message': f"Sold {symbol}."})
+
+        else:
+            # Handle invalid message types
+            return JSONResponse({'status': 'error', 'message': 'Invalid message type.'}, status_code=400)
+
+    except Exception as e:
+        # Log the error for debugging
+        logging.error(f"Error processing webhook: {e}")
+        return JSONResponse({'status': 'error', 'message': 'Server error.'}, status_code=500)
+
+
+webhook_routes = [Route('/', webhook, methods=['POST'])]
@@ -0,0 +1,232 @@
+
+import asyncio
+import logging
+import aiohttp
+from services.async_price_fetcher import get_live_price_with_fallback
+
+# State variables
+is_trading = True
+
+
+class AsyncAlpacaClient:
+    """Minimal asyncio Alpaca REST client sharing one pooled HTTP connection set."""
+
+    def __init__(self, api_key, secret_key, base_url, max_connections=100, timeout=10.0):
+        self._session = aiohttp.ClientSession(
+            base_url=base_url,
+            headers={
+                "accept": "application/json",
+                "APCA-API-KEY-ID": api_key,
+                "APCA-API-SECRET-KEY": secret_key,
+            },
+            connector=aiohttp.TCPConnector(limit=max_connections),
+            timeout=aiohttp.ClientTimeout(total=timeout),
+        )
+
+    async def _request(self, method, path, **kwargs):
+        async with self._session.request(method, path, **kwargs) as response:
+            response.raise_for_status()
+            return await response.json()
+
+    async def get_account(self):
+        """Return the account as a dict (``cash`` etc. are strings, as sent by Alpaca)."""
+        return await self._request("GET", "/v2/account")
+
+    async def list_positions(self):
+        """Return all open positions as a list of dicts."""
+        return await self._request("GET", "/v2/positions")
+
+    async def submit_order(self, symbol, qty, side, type, time_in_force):
+        """Submit an order and return it as a dict."""
+        order_data = {
+            'symbol': symbol,
+            'qty': qty,
+            'side': side,
+            'type': type,
+            'time_in_force': time_in_force,
+        }
+        return await self._request("POST", "/v2/orders", json=order_data)
+
+    async def close(self):
+        await self._session.close()
+
+
+async def execute_trade(client, price_client, symbol, action):
+    """Execute a trade for the given symbol and action."""
+    if not is_trading:
+        logging.info("Trading is currently paused.")
+        return
+
+    try:
+        # Account, price and positions are independent lookups, so fetch them together
+        account_info, current_price, positions = await asyncio.gather(
+            client.get_account(),
+            get_live_price_with_fallback(price_client, symbol),
+            get_open_positions(client),
+        )
+        usd_balance = float(account_info['cash'])
+        logging.debug(f"Account balance: ${usd_balance:.2f}")
+
+        if current_price is None or current_price <= 0:
+            logging.error(f"Invalid current price for {symbol}: {current_price}")
+            return
+
+        # Fetch prices for all positions concurrently
+        pos_prices = await asyncio.gather(
+            *(get_live_price_with_fallback(price_client, position['symbol']) for position in positions)
+        )
+        valid_positions = []
+        for position, pos_price in zip(positions, pos_prices):
+            if pos_price is None or pos_price <= 0:
+                logging.error(f"Invalid price for {position['symbol']}: {pos_price}")
+                continue
+            valid_positions.append((position, pos_price))
+
+        # Calculate the market value of all positions
+        total_market_value = sum(float(position['market_value']) for position, _ in valid_positions)
+
+        # Calculate target allocation based on total market value
+        total_positions = len(positions) + 1  # Include the new position
+        target_allocation = (total_market_value + usd_balance) / total_positions  # Equal allocation for all positions
+        logging.debug(f"Target allocation per position: ${target_allocation:.2f}")
+
+        # Sell excess for each existing position first
+        sells = []
+        for position, pos_price in valid_positions:
+            # Calculate the current value of the position
+            position_value = float(position['market_value'])
+            logging.debug(f"Current position value for {position['symbol']}: {position_value:.2f}")
+
+            # If the position value exceeds the target allocation, sell the excess
+            if position_value > target_allocation:
+                excess_value = position_value - target_allocation
+                excess_qty = excess_value / pos_price
+                sells.append((position['symbol'], excess_qty, excess_value))
+
+        results = await asyncio.gather(*(
+            client.submit_order(symbol=sell_symbol, qty=excess_qty, side='sell', type='market', time_in_force='day')
+            for sell_symbol, excess_qty, _ in sells
+        ), return_exceptions=True)
+
+        # Log every sell that went through, even if a sibling order failed, so the audit log stays complete
+        total_freed_cash = 0
+        failures = []
+        for (sell_symbol, excess_qty, excess_value), result in zip(sells, results):
+            if isinstance(result, BaseException):
+                logging.error(f"Error selling excess {sell_symbol}: {result}")
+                failures.append(result)
+                continue
+            logging.info(f"Sold {excess_qty:.2f} shares of {sell_symbol} to free up ${excess_value:.2f}")
+            total_freed_cash += excess_value
+        if failures:
+            # As in the sync version, a failed sell aborts the trade before the buy
+            raise failures[0]
+
+        # After selling excess positions, use the freed cash or balance to buy the new symbol
+        total_available_cash = total_freed_cash + usd_balance  # Combine freed cash and cash balance
+        if total_available_cash > 0:
+            adjusted_cash = total_available_cash / 1.0105  # Apply 1.05% buffer
+            qty_to_buy = adjusted_cash / current_price
+            qty_to_buy = max(qty_to_buy, 0)  # Ensure no negative or zero quantities
+
+            if action == 'buy':
+                # Execute buy order for the new symbol
+                await client.submit_order(
+                    symbol=symbol,
+                    qty=qty_to_buy,
+                    side='buy',
+                    type='market',
+                    time_in_force='day'
+                )
+                logging.info(f"Bought {qty_to_buy:.2f} shares of {symbol} for ${adjusted_cash:.2f} (adjusted for buffer).")
+
+        # Rebalance portfolio
+        logging.info("Portfolio rebalanced successfully.")
+
+    except Exception as e:
+        logging.error(f"Error executing trade for {symbol}: {e}")
+
+
+async def execute_sell(client, price_client, symbol):
+    """Sell one position completely and rebalance remaining positions"""
+    if not is_trading:
+        logging.info("Trading is currently paused.")
+        return
+
+    try:
+        # Get account information and open positions
+        account_info, positions = await asyncio.gather(client.get_account(), get_open_positions(client))
+        usd_balance = float(account_info['cash'])
+
+        # Get current prices for all positions
+        prices = await asyncio.gather(
+            *(get_live_price_with_fallback(price_client, position['symbol']) for position in positions)
+        )
+        current_prices = {position['symbol']: price for position, price in zip(positions, prices)}
+
+        # Calculate the new allocation for each remaining position
+        total_positions = len(positions)
+        new_allocation = usd_balance / total_positions  # allocation for each position
+
+        # Identify the position to sell
+        position_to_sell = positions[0]  # Selling the first position
+        sell_price = current_prices[position_to_sell['symbol']]
+        sell_quantity = position_to_sell['quantity']  # Quantity to sell
+
+        # Sell the identified position
+        await place_order(client, position_to_sell['symbol'], sell_quantity, 'sell')
+
+        # Calculate how much to buy for each of the remaining positions
+        total_proceeds = sell_price * sell_quantity
+        remaining_positions = [pos for pos in positions if pos['symbol'] != position_to_sell['symbol']]
+        remaining_count = len(remaining_positions)
+
+        # Allocate the proceeds equally across the remaining positions
+        amount_per_position = total_proceeds / remaining_count
+        await asyncio.gather(*(
+            place_order(client, position['symbol'], max(amount_per_position / current_prices[position['symbol']], 0), 'buy')
+            for position in remaining_positions
+        ))
+
+        # Log portfolio status
+        logging.info(f"Rebalanced portfolio. Each remaining position now holds approximately ${new_allocation:.2f}.")
+
+    except Exception as e:
+        logging.error(f"Error executing rebalancing after sell: {e}")
+
+
+async def place_order(client, symbol, quantity, action):
+    """Helper function to place an order."""
+    if quantity <= 0:
+        logging.error(f"Invalid quantity for {action} order on {symbol}: {quantity}")
+        return False  # Return False if the quantity is invalid
+
+    try:
+        order = await client.submit_order(symbol=symbol, qty=quantity, side=action, type='market', time_in_force='day')
+        if order['status'] == 'accepted':  # Assuming 'accepted' is the status for a successful order
+            logging.info(f"{action.capitalize()} {quantity} of {symbol}.")
+            return True
+        else:
+            logging.error(f"Failed to place order for {symbol}. Status: {order['status']}, Response: {order}")
+            return False
+    except Exception as e:
+        logging.error(f"Error placing {action} order for {symbol}: {e}")
+        return False
+
+
+async def get_open_positions(client):
+    """Fetch and return all open positions in the portfolio."""
+    try:
+        positions = await client.list_positions()
+        return [
+            {
+                "symbol": pos['symbol'],
+                "quantity": float(pos['qty']),  # Use float for fractional shares
+                "market_value": float(pos['market_value'])
+            }
+            for pos in positions
+        ]
+    except Exception as e:
+        logging.error(f"Error fetching open positions: {e}")
+        return []
+
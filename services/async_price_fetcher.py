@@ -0,0 +1,30 @@
+import aiohttp
+import logging
+from urllib.parse import quote
+
+
+def create_price_client(base_url, max_connections=100, timeout=10.0):
+    """Create a pooled HTTP session for the Yahoo Finance chart API."""
+    return aiohttp.ClientSession(
+        base_url=base_url,
+        headers={"accept": "application/json", "User-Agent": "Mozilla/5.0"},
+        connector=aiohttp.TCPConnector(limit=max_connections),
+        timeout=aiohttp.ClientTimeout(total=timeout),
+    )
+
+
+async def get_live_price_with_fallback(client, symbol):
+    """Async counterpart of services.price_fetcher.get_live_price_with_fallback."""
+    try:
+        path = f"/v8/finance/chart/{quote(symbol, safe='')}"
+        async with client.get(path, params={"range": "1d", "interval": "1d"}) as response:
+            response.raise_for_status()
+            result = (await response.json())["chart"]["result"]
+        closes = [close for close in result[0]["indicators"]["quote"][0]["close"] if close is not None] if result else []
+        if closes:
+            return closes[-1]
+        else:
+            raise ValueError("No data from Yahoo Finance.")
+    except Exception as e:
+        logging.error(f"Error fetching price for {symbol}: {e}")
+        return None
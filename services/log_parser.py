@@ -0,0 +1,104 @@
+import re
+from datetime import datetime
+
+# Record tables produced from the bot's log lines
+DECISIONS = "decisions"
+ORDERS = "orders"
+PRICES = "prices"
+ERRORS = "errors"
+
+# Matches every format the bot logs with:
+#   base.py                   '%(asctime)s - %(levelname)s - %(message)s'
+#   services/logger.py        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+#   services/alpaca_client.py '%(asctime)s - %(message)s'
+LINE_RE = re.compile(
+    r'^(?P<ts>\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3}) - '
+    r'(?:(?!(?:DEBUG|INFO|WARNING|ERROR|CRITICAL) - )(?P<logger>[\w.]+) - )?'
+    r'(?:(?P<level>DEBUG|INFO|WARNING|ERROR|CRITICAL) - )?'
+    r'(?P<message>.*)$'
+)
+
+# base.execute_trade
+DECISION_RE = re.compile(
+    r'^(?:(?P<submitted_at>.*?) - )?Symbol: (?P<symbol>[^,]+), Decision: (?P<decision>\w+), '
+    r'Price: \$(?P<price>[^,]+), Amount: \$(?P<amount>\S+)$'
+)
+
+# (regex, fixed side or None when the side is captured) for each order message
+ORDER_PATTERNS = (
+    # services.alpaca_client.execute_trade
+    (re.compile(r'^Sold (?P<qty>\S+) shares of (?P<symbol>\S+) to free up \$(?P<notional>\S+)$'), 'sell'),
+    (re.compile(r'^Bought (?P<qty>\S+) shares of (?P<symbol>\S+) for \$(?P<notional>\S+) \(adjusted for buffer\)\.$'), 'buy'),
+    # services.alpaca_client.place_order
+    (re.compile(r'^(?P<side>Buy|Sell) (?P<qty>\S+) of (?P<symbol>\S+)\.$'), None),
+    # base.process_last_two_filled_sells / base.execute_sell
+    (re.compile(r'^Successfully placed (?P<side>buy|sell) order for (?P<symbol>\S+)\. Quantity: (?P<qty>\S+)$'), None),
+    (re.compile(r'^Sold (?P<qty>\S+) of (?P<symbol>\S+)\. Amount obtained: \$(?P<notional>\S+)$'), 'sell'),
+)
+
+# Error messages logged without a level by the '%(asctime)s - %(message)s' format
+# (services/alpaca_client.py, whose basicConfig also wins for app.py)
+ERROR_PREFIXES = ('Error', 'Failed', 'Invalid')
+
+# base.webhook
+PRICE_RE = re.compile(r'^Current Price for (?P<symbol>\S+): (?P<price>\S+)$')
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_line(line):
+    """Parse one log line.
+
+    Returns ``(table, date, timestamp, row)`` where ``date`` is the ``YYYY-MM-DD``
+    partition key and ``row`` is a tuple ordered like the table's schema in
+    log_to_columnar.SCHEMAS (after its ``ts``/``source``/``offset`` columns), or
+    ``None`` for lines that carry no analytics record (werkzeug banners,
+    continuation lines, ...).
+    """
+    match = LINE_RE.match(line)
+    if not match:
+        return None
+    ts, logger, level, message = match.group('ts', 'logger', 'level', 'message')
+    record = _parse_message(logger, level, message)
+    if record is None:
+        return None
+    table, row = record
+    return table, ts[:10], datetime.fromisoformat(ts.replace(',', '.')), row
+
+
+def _parse_message(logger, level, message):
+    if level in ('ERROR', 'CRITICAL') or (level is None and message.startswith(ERROR_PREFIXES)):
+        return ERRORS, (logger, level, message)
+
+    # Cheap substring checks keep the common no-match path off the regex engine
+    if 'Decision: ' in message:
+        decision = DECISION_RE.match(message)
+        if decision:
+            return DECISIONS, (
+                decision['submitted_at'],
+                decision['symbol'],
+                decision['decision'],
+                _to_float(decision['price']),
+                _to_float(decision['amount']),
+            )
+    elif message.startswith('Current Price for '):
+        price = PRICE_RE.match(message)
+        if price:
+            return PRICES, (price['symbol'], _to_float(price['price']))
+    elif ' of ' in message or ' order for ' in message:
+        for pattern, side in ORDER_PATTERNS:
+            order = pattern.match(message)
+            if order:
+                fields = order.groupdict()
+                return ORDERS, (
+                    fields['symbol'],
+                    side or fields['side'].lower(),
+                    _to_float(fields['qty']),
+                    _to_float(fields.get('notional')),
+                )
+    return None
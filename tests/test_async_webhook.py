@@ -0,0 +1,138 @@
+import asyncio
+import importlib
+import logging
+from types import SimpleNamespace
+
+import pytest
+from starlette.applications import Starlette
+from starlette.routing import Mount
+from starlette.testclient import TestClient
+
+import routes.async_webhook_routes as async_routes
+import services.async_alpaca_client as async_alpaca
+
+PRICES = {"A": 100.0, "B": 50.0, "C": 10.0}
+POSITIONS = [
+    {"symbol": "A", "qty": "30", "market_value": "3000"},
+    {"symbol": "B", "qty": "10", "market_value": "500"},
+]
+
+
+class StubAlpaca:
+    """Async stand-in for AsyncAlpacaClient that records submitted orders."""
+
+    def __init__(self, cash="1000", positions=POSITIONS, reject=()):
+        self.cash = cash
+        self.positions = positions
+        self.reject = set(reject)
+        self.orders = []
+
+    async def get_account(self):
+        return {"cash": self.cash}
+
+    async def list_positions(self):
+        return self.positions
+
+    async def submit_order(self, symbol, qty, side, type, time_in_force):
+        self.orders.append((symbol, side, qty))
+        if symbol in self.reject:
+            raise RuntimeError("rejected")
+        return {"symbol": symbol, "qty": qty, "side": side, "status": "accepted"}
+
+
+async def _fake_price(client, symbol):
+    return PRICES.get(symbol)
+
+
+@pytest.fixture(autouse=True)
+def stub_prices(monkeypatch):
+    monkeypatch.setattr(async_routes, "get_live_price_with_fallback", _fake_price)
+    monkeypatch.setattr(async_alpaca, "get_live_price_with_fallback", _fake_price)
+
+
+@pytest.fixture
+def alpaca():
+    return StubAlpaca()
+
+
+@pytest.fixture
+def client(alpaca):
+    app = Starlette(routes=[Mount("/webhook", routes=async_routes.webhook_routes)])
+    app.state.alpaca = alpaca
+    app.state.prices = None
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.mark.parametrize("payload, message", [
+    ({"symbol": "C"}, "Invalid JSON data format"),
+    ({"message": "buy"}, "Invalid JSON data format"),
+    ({"symbol": "C", "message": "hold"}, "Invalid message type."),
+])
+def test_webhook_rejects_bad_payloads(client, payload, message):
+    response = client.post("/webhook/", json=payload)
+    assert response.status_code == 400
+    assert response.json() == {"status": "error", "message": message}
+
+
+def test_webhook_buy_without_price(client, alpaca):
+    response = client.post("/webhook/", json={"symbol": "ZZZ", "message": "buy"})
+    assert response.status_code == 500
+    assert response.json() == {"status": "error", "message": "Unable to fetch price for ZZZ."}
+    assert alpaca.orders == []
+
+
+def test_webhook_buy(client, alpaca):
+    response = client.post("/webhook/", json={"symbol": "C", "message": "BUY"})
+    assert response.status_code == 200
+    assert response.json() == {"status": "success", "message": "Bought C at $10.00."}
+    assert ("C", "buy") in [(symbol, side) for symbol, side, _ in alpaca.orders]
+
+
+def test_webhook_sell(client, alpaca):
+    response = client.post("/webhook/", json={"symbol": "A", "message": "sell"})
+    assert response.status_code == 200
+    assert response.json() == {"status": "success", "message": "Sold A."}
+    assert alpaca.orders[0] == ("A", "sell", 30.0)
+
+
+def test_execute_trade_matches_sync_version(monkeypatch):
+    monkeypatch.setenv("APCA_API_KEY_ID", "test")
+    monkeypatch.setenv("APCA_API_SECRET_KEY", "test")
+    sync_alpaca = importlib.import_module("services.alpaca_client")
+
+    sync_orders = []
+
+    def submit_order(symbol, qty, side, type, time_in_force):
+        sync_orders.append((symbol, side, qty))
+        return SimpleNamespace(status="accepted")
+
+    monkeypatch.setattr(sync_alpaca, "trading_client", SimpleNamespace(
+        get_account=lambda: SimpleNamespace(cash="1000"),
+        list_positions=lambda: [SimpleNamespace(**position) for position in POSITIONS],
+        submit_order=submit_order,
+    ))
+    monkeypatch.setattr(sync_alpaca, "get_live_price_with_fallback", PRICES.get)
+    sync_alpaca.execute_trade("C", "buy")
+
+    stub = StubAlpaca()
+    asyncio.run(async_alpaca.execute_trade(stub, None, "C", "buy"))
+
+    assert [order[:2] for order in stub.orders] == [order[:2] for order in sync_orders] == [("A", "sell"), ("C", "buy")]
+    assert [order[2] for order in stub.orders] == pytest.approx([order[2] for order in sync_orders])
+
+
+def test_execute_trade_logs_sells_that_went_through(caplog):
+    positions = [{"symbol": symbol, "qty": "10", "market_value": "3000"} for symbol in ("A", "B", "C")]
+    stub = StubAlpaca(positions=positions, reject={"A"})
+
+    with caplog.at_level(logging.INFO):
+        asyncio.run(async_alpaca.execute_trade(stub, None, "B", "buy"))
+
+    messages = [record.getMessage() for record in caplog.records]
+    assert any(message.startswith("Sold") and " of B " in message for message in messages)
+    assert any(message.startswith("Sold") and " of C " in message for message in messages)
+    assert "Error selling excess A: rejected" in messages
+    assert "Error executing trade for B: rejected" in messages
+    # No buy once a sell has failed
+    assert [side for _, side, _ in stub.orders] == ["sell", "sell", "sell"]
@@ -0,0 +1,55 @@
+from datetime import datetime
+
+import pytest
+
+from log_to_columnar import SCHEMAS
+from services.log_parser import DECISIONS, ERRORS, ORDERS, PRICES, parse_line
+
+
+@pytest.mark.parametrize("line, table, row", [
+    # base.execute_trade
+    ("2024-12-02 14:30:01,123 - INFO - 2024-12-02 14:30:00.950000+00:00 - Symbol: BTCUSD, Decision: buy, "
+     "Price: $95871.2, Amount: $5000.00",
+     DECISIONS, ("2024-12-02 14:30:00.950000+00:00", "BTCUSD", "buy", 95871.2, 5000.0)),
+    # base.webhook
+    ("2024-12-02 14:30:01,123 - INFO - Current Price for BTCUSD: 95871.203125",
+     PRICES, ("BTCUSD", 95871.203125)),
+    # services.alpaca_client.execute_trade
+    ("2024-12-02 14:30:01,123 - Sold 1.25 shares of AAPL to free up $300.00",
+     ORDERS, ("AAPL", "sell", 1.25, 300.0)),
+    ("2024-12-02 14:30:01,123 - Bought 10.40 shares of MSFT for $4386.12 (adjusted for buffer).",
+     ORDERS, ("MSFT", "buy", 10.4, 4386.12)),
+    # services.alpaca_client.place_order
+    ("2024-12-02 14:30:01,123 - Sell 3.5 of AAPL.", ORDERS, ("AAPL", "sell", 3.5, None)),
+    ("2024-12-02 14:30:01,123 - Buy 0.41 of MSFT.", ORDERS, ("MSFT", "buy", 0.41, None)),
+    # base.process_last_two_filled_sells / base.execute_sell
+    ("2024-12-02 14:30:01,123 - INFO - Successfully placed buy order for AAPL. Quantity: 12.345",
+     ORDERS, ("AAPL", "buy", 12.345, None)),
+    ("2024-12-02 14:30:01,123 - INFO - Sold 0.5049 of ETHUSD. Amount obtained: $1834.22",
+     ORDERS, ("ETHUSD", "sell", 0.5049, 1834.22)),
+    # services/logger.py and base.py formats carry the level
+    ("2024-12-02 14:30:01,123 - root - ERROR - Error processing webhook: boom",
+     ERRORS, ("root", "ERROR", "Error processing webhook: boom")),
+    ("2024-12-02 14:30:01,123 - ERROR - Error placing order: insufficient balance",
+     ERRORS, (None, "ERROR", "Error placing order: insufficient balance")),
+    # services/alpaca_client.py format has no level
+    ("2024-12-02 14:30:01,123 - Error executing trade for AAPL: boom",
+     ERRORS, (None, None, "Error executing trade for AAPL: boom")),
+    ("2024-12-02 14:30:01,123 - Invalid current price for AAPL: None",
+     ERRORS, (None, None, "Invalid current price for AAPL: None")),
+    ("2024-12-02 14:30:01,123 - Failed to place order for AAPL. Status: rejected, Response: {}",
+     ERRORS, (None, None, "Failed to place order for AAPL. Status: rejected, Response: {}")),
+])
+def test_parse_line(line, table, row):
+    assert parse_line(line) == (table, "2024-12-02", datetime(2024, 12, 2, 14, 30, 1, 123000), row)
+    assert len(row) == len(SCHEMAS[table].names[3:])
+
+
+@pytest.mark.parametrize("line", [
+    "2024-11-30 16:01:56,587 - werkzeug - INFO - \x1b[33mPress CTRL+C to quit\x1b[0m",
+    " * Running on http://127.0.0.1:5001",
+    "2024-12-02 14:30:01,123 - Portfolio rebalanced successfully.",
+    "2024-12-02 14:30:01,123 - INFO - Invalid JSON is only an error when logged at ERROR",
+])
+def test_parse_line_skips_non_records(line):
+    assert parse_line(line) is None
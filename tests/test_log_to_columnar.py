@@ -0,0 +1,55 @@
+import os
+
+import pyarrow.parquet as pq
+
+from log_to_columnar import convert_logs
+
+
+def _order(day, qty):
+    return f"2024-12-{day:02d} 09:30:00,000 - Buy {qty} of AAPL.\n"
+
+
+def _order_qtys(out_dir):
+    return sorted(pq.read_table(os.path.join(out_dir, "orders")).column("qty").to_pylist())
+
+
+def _files(out_dir):
+    return [name for _, _, names in os.walk(out_dir) for name in names]
+
+
+def test_rerun_only_parses_new_complete_lines(tmp_path):
+    log, out = tmp_path / "app.log", str(tmp_path / "out")
+    first = _order(2, 1) + _order(2, 2)
+    log.write_text(first + _order(3, 3)[:20])  # trailing line still being written
+
+    state = convert_logs([str(log)], out)
+    assert state[str(log)]["offset"] == len(first)
+    assert _order_qtys(out) == [1.0, 2.0]
+
+    with open(log, "a") as f:
+        f.write(_order(3, 3)[20:] + _order(4, 4))
+    convert_logs([str(log)], out)
+    assert _order_qtys(out) == [1.0, 2.0, 3.0, 4.0]
+    assert sorted(os.listdir(os.path.join(out, "orders"))) == ["date=2024-12-02", "date=2024-12-03", "date=2024-12-04"]
+    assert not [name for name in _files(out) if name.endswith(".tmp")]
+
+    # Nothing new: no parts written
+    files = _files(out)
+    convert_logs([str(log)], out)
+    assert _files(out) == files
+
+
+def test_truncated_log_starts_over_without_overwriting_parts(tmp_path):
+    log, out = tmp_path / "app.log", str(tmp_path / "out")
+    log.write_text(_order(2, 1) + _order(2, 2))
+    convert_logs([str(log)], out)
+
+    # copytruncate: same inode, rewritten from the start and regrown past the old offset
+    inode = os.stat(log).st_ino
+    with open(log, "r+") as f:
+        f.truncate(0)
+        f.write(_order(5, 5) + _order(5, 6) + _order(5, 7))
+    assert os.stat(log).st_ino == inode
+
+    convert_logs([str(log)], out)
+    assert _order_qtys(out) == [1.0, 2.0, 5.0, 6.0, 7.0]